@@ -34,3 +34,64 @@ string = '"{0}"'.format(r'12345\"' * length)
         'name': "Long mixed string (plain:quote = 5:1)",
     },
 ]
+
+code_setup = common_setup + r"""
+string = '({0})'.format(' '.join(
+    '(define f{0} (lambda (x y) (+ x y {1} 2.5 "s")))'.format(i % 100, i)
+    for i in range(length // 10)))
+"""
+
+data += [
+    {
+        'code': do_loads,
+        'setup': code_setup,
+        'name': "Code-like nested lists of repeated symbols and numbers",
+    },
+    {
+        'code': do_loads,
+        'setup': common_setup + r"""
+string = '({0}\n)'.format(''.join(
+    '\n  a ; comment {0}'.format(i) for i in range(length)))
+""",
+        'name': "One symbol per line with line comments",
+    },
+    {
+        'code': 'sexpdata.dumps(obj)',
+        'setup': code_setup + r"""
+obj = sexpdata.loads(string)
+""",
+        'name': "Dump code-like nested lists",
+    },
+    {
+        'code': 'sexpdata.dumps(obj, pretty_print=True)',
+        'setup': code_setup + r"""
+obj = sexpdata.loads(string)
+""",
+        'name': "Pretty-print code-like nested lists",
+    },
+]
+
+do_feed = r"""
+parser = sexpdata.IncrementalParser()
+for chunk in chunks:
+    parser.feed(chunk)
+parser.finish()
+"""
+
+data += [
+    {
+        'code': do_feed,
+        'setup': code_setup + r"""
+chunks = [string[i:i + 64] for i in range(0, len(string), 64)]
+""",
+        'name': "Feed code-like nested lists in 64-character chunks",
+    },
+    {
+        'code': do_feed,
+        'setup': common_setup + r"""
+string = "a'b" * length
+chunks = [string[i:i + 16] for i in range(0, len(string), 16)]
+""",
+        'name': "Feed one long symbol in 16-character chunks",
+    },
+]
@@ -1,5 +1,4 @@
 # [[[cog import cog; cog.outl('"""\n%s\n"""' % file('README.rst').read()) ]]]
-from __future__ import unicode_literals
 """
 S-expression parser for Python
 ==============================
@@ -70,6 +69,8 @@ __license__ = 'BSD License'
 __all__ = [
     # API functions:
     'load', 'loads', 'dump', 'dumps', 'parse',
+    # Incremental parsing:
+    'IncrementalParser',
     # Utility functions:
     'car', 'cdr',
     # S-expression classes:
@@ -78,31 +79,11 @@ __all__ = [
 
 import re
 from collections import namedtuple
-try:
-    from collections.abc import Iterable, Mapping, Sequence
-except ImportError:
-    # Python < 3.3
-    from collections import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache, singledispatch
 from itertools import chain
 from string import whitespace
-
-
-### PEP fallbacks
-
-try:
-    from functools import singledispatch
-except ImportError:
-    from singledispatch import singledispatch
-
-
-### Python 3 compatibility
-
-try:
-    unicode
-    PY3 = False
-except NameError:
-    unicode = str  # Python 3
-    PY3 = True
+from weakref import WeakValueDictionary, finalize, ref
 
 
 ### Interface
@@ -280,7 +261,7 @@ def dumps(obj, **kwds):
     (a '(b))
 
     """
-    return unicode(tosexp(obj, **kwds))
+    return str(tosexp(obj, **kwds))
 
 
 def car(obj):
@@ -401,7 +382,7 @@ def _(obj, tuple_as='list', **kwds):
         raise ValueError('tuple_as={0!r} is not valid'.format(tuple_as))
 
 
-@tosexp.register(unicode)
+@tosexp.register(str)
 def _(obj, str_as='string', **kwds):
     kwds['str_as'] = str_as
     if str_as == 'symbol':
@@ -428,7 +409,9 @@ def _(obj, **kwds):
     return str(obj)
 
 
-class String(unicode):
+class String(str):
+
+    __slots__ = ()
 
     def __eq__(self, other):
         """
@@ -442,20 +425,21 @@ class String(unicode):
         False
         >>> all(x != y for x, y in permutations(S, 2))
         True
+        >>> D = {'a': 1, String('a'): 2, Symbol('a'): 3}
+        >>> len(D)
+        3
         """
+        if self is other:
+            return True
         return (self.__class__ == other.__class__ and
-                unicode.__eq__(self, other))
+                str.__eq__(self, other))
 
     def __ne__(self, other):
         return not self == other
 
-    def __hash__(self):
-        """
-        >>> D = {'a': 1, String('a'): 2, Symbol('a'): 3}
-        >>> len(D)
-        3
-        """
-        return unicode.__hash__(self)
+    # Defining __eq__ resets __hash__; restore the C-level str hash
+    # rather than wrapping it in a Python-level method.
+    __hash__ = str.__hash__
 
     _lisp_quoted_specials = [  # from Pymacs
         ('\\', '\\\\'),    # must come first to avoid doubly quoting "\"
@@ -463,13 +447,19 @@ class String(unicode):
         ('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t')]
 
     _lisp_quoted_to_raw = dict((q, r) for (r, q) in _lisp_quoted_specials)
+    _lisp_quoted_chars = frozenset(r for (r, q) in _lisp_quoted_specials)
 
     def __repr__(self):
         return '{0}({1})'.format(self.__class__.__name__,
-                                 unicode.__repr__(self))
+                                 str.__repr__(self))
 
     @classmethod
     def quote(cls, string):
+        # Most strings and symbols are short and have nothing to quote.
+        # For those, one set test beats a replace() pass per special
+        # character; longer strings are faster with replace() alone.
+        if len(string) < 16 and cls._lisp_quoted_chars.isdisjoint(string):
+            return str(string)
         for (s, q) in cls._lisp_quoted_specials:
             string = string.replace(s, q)
         return string
@@ -479,7 +469,7 @@ class String(unicode):
         return cls._lisp_quoted_to_raw.get(string, string)
 
     def value(self):
-        return unicode(self)
+        return str(self)
 
 
 @tosexp.register(String)
@@ -489,6 +479,30 @@ def _(obj, **kwds):
 
 class Symbol(String):
 
+    __slots__ = ('__weakref__',)
+
+    # Live symbols by name.  Equal names give the same object, so
+    # repeated identifiers across parses cost one allocation and compare
+    # by identity.
+    _interned = WeakValueDictionary()
+
+    def __new__(cls, *args, **kwds):
+        if cls is not Symbol:
+            return super().__new__(cls, *args, **kwds)
+        # Key on the plain string: Symbol(1) and Symbol(True) are different
+        # names, and the pool must not keep the argument itself alive.
+        name = str(*args, **kwds)
+        try:
+            return cls._interned[name]
+        except KeyError:
+            symbol = cls._interned[name] = super().__new__(cls, name)
+            return symbol
+
+    def __reduce__(self):
+        # The __weakref__ slot would otherwise break protocols 0 and 1;
+        # this also re-interns the symbol on load.
+        return (self.__class__, (str(self),))
+
     _lisp_quoted_specials = [
         ('\\', '\\\\'),    # must come first to avoid doubly quoting "\"
         ("'", r"\'"), ("`", r"\`"), ('"', r'\"'),
@@ -498,6 +512,7 @@ class Symbol(String):
     ]
 
     _lisp_quoted_to_raw = dict((q, r) for (r, q) in _lisp_quoted_specials)
+    _lisp_quoted_chars = frozenset(r for (r, q) in _lisp_quoted_specials)
 
 
 @tosexp.register(Symbol)
@@ -507,6 +522,8 @@ def _(obj, **kwds):
 
 class Quoted(namedtuple('Quoted', 'x')):
 
+    __slots__ = ()
+
     def __repr__(self):
         return '{0.__class__.__name__}({0.x!r})'.format(self)
 
@@ -517,6 +534,8 @@ def _(obj, **kwds):
 
 class Delimiters(namedtuple('Delimiters', 'I')):
 
+    __slots__ = ()
+
     def __new__(cls, *args):
         if not args:
             raise ValueError("Expected an Iterable/Mapping argument or *args")
@@ -525,47 +544,68 @@ class Delimiters(namedtuple('Delimiters', 'I')):
         if isinstance(x, Mapping):
             plist_pairs = ((Symbol(':' + k), v) for k, v in x.items())
             return tuple.__new__(cls, (tuple(chain.from_iterable(plist_pairs)),))
-        elif isinstance(x, (unicode, bytes)) or not isinstance(x, Iterable):
+        elif isinstance(x, (str, bytes)) or not isinstance(x, Iterable):
             return tuple.__new__(cls, ((x,),)) # unary *args
         elif isinstance(x, Sequence):
             return tuple.__new__(cls, (x,))
         else: # isinstance(x, Iterable)
             return tuple.__new__(cls, (tuple(x),))
 
+    # Weak references to the direct subclasses, by opener.  Rebuilt on
+    # demand after a subclass is created or garbage collected.
+    _by_opener = None
+
+    def __init_subclass__(cls, **kwds):
+        super().__init_subclass__(**kwds)
+        Delimiters._forget_subclasses()
+        finalize(cls, Delimiters._forget_subclasses)
+
+    @staticmethod
+    def _forget_subclasses():
+        Delimiters._by_opener = None
+
+    @staticmethod
+    def _subclasses_by_opener():
+        by_opener = Delimiters._by_opener
+        if by_opener is None:
+            by_opener = Delimiters._by_opener = {
+                cls.opener: ref(cls) for cls in Delimiters.__subclasses__()}
+        return by_opener
+
     @staticmethod
     def from_opener(opener, val):
-        cls_map = dict((cls.opener, cls) for cls in Delimiters.__subclasses__())
-        if opener in cls_map.keys():
-            return cls_map[opener](val)
+        cls_map = Delimiters._subclasses_by_opener()
+        if opener in cls_map:
+            return cls_map[opener]()(val)
         else:
             raise TypeError
 
     @staticmethod
     def get_brackets():
-        return {cls.opener: cls.closer for cls in Delimiters.__subclasses__()}
+        return {opener: cls().closer
+                for (opener, cls) in Delimiters._subclasses_by_opener().items()}
 
 @tosexp.register(Delimiters)
 def _(self, **kwds):
+    opener, closer = self.__class__.opener, self.__class__.closer
+    # Call the registered handlers directly; going through the tosexp()
+    # wrapper costs an extra call per element.
+    dispatch = tosexp.dispatch
+    exprs = [dispatch(x.__class__)(x, **kwds) for x in self.I]
+
+    # Flat output is a single join; it needs no re-indentation pass.
+    if not kwds.get("pretty_print"):
+        return opener + " ".join(exprs) + closer
+
     # Don't break up expressions produced by certain overloads of tosexp
     dont_break = all(tosexp.dispatch(type(x)) not in DONT_BREAK_OVERLOADS for x in self.I)
+    if dont_break:
+        return opener + " ".join(exprs) + closer
 
-    if "pretty_print" in kwds and kwds["pretty_print"] and not dont_break:
-        expr_separator = "\n"
-        exprs_indent = kwds["indent_as"] if "indent_as" in kwds else "  "
-        exprs_separator = "\n"
-    else:
-        expr_separator = " "
-        exprs_indent = ""
-        exprs_separator = ""
-
-    exprs = expr_separator.join(tosexp(x, **kwds) for x in self.I)
-    indented_exprs = "".join(exprs_indent + line for line in exprs.splitlines(True))
-
-    return (self.__class__.opener +
-            exprs_separator +
-            indented_exprs +
-            exprs_separator +
-            self.__class__.closer)
+    exprs_indent = kwds["indent_as"] if "indent_as" in kwds else "  "
+    indented_exprs = "".join(exprs_indent + line
+                             for line in "\n".join(exprs).splitlines(True))
+    return opener + "\n" + indented_exprs + "\n" + closer
 DONT_BREAK_OVERLOADS = [tosexp.dispatch(c) for c in (object, Iterable, Mapping, tuple, Delimiters)]
 
 
@@ -582,6 +622,8 @@ class Brackets(Delimiters):
     '[:a 1]'
     """
 
+    __slots__ = ()
+
     opener, closer = '[', ']'
 
 
@@ -602,6 +644,8 @@ class Parens(Delimiters):
     '[0 (1 2 3) 4]'
     """
 
+    __slots__ = ()
+
     opener, closer = '(', ')'
 
 
@@ -615,7 +659,7 @@ def bracket(val, bra):
 class ExpectClosingBracket(Exception):
 
     def __init__(self, got, expect):
-        super(ExpectClosingBracket, self).__init__(
+        super().__init__(
             "Not enough closing brackets. "
             "Expected {0!r} to be the last letter in the sexp. "
             "Got: {1!r}".format(expect, got))
@@ -624,7 +668,7 @@ class ExpectClosingBracket(Exception):
 class ExpectNothing(Exception):
 
     def __init__(self, got):
-        super(ExpectNothing, self).__init__(
+        super().__init__(
             "Too many closing brackets. "
             "Expected no character left in the sexp. "
             "Got: {0!r}".format(got))
@@ -632,18 +676,19 @@ class ExpectNothing(Exception):
 class ExpectSExp(Exception):
 
     def __init__(self, pos):
-        super(ExpectSExp, self).__init__(
+        super().__init__(
             'No s-exp is found after an apostrophe'
             ' at position {0}'.format(pos))
 
 
-class Parser(object):
+class Parser:
 
     brackets: dict
-    closing_brackets: set
-    _atom_end_basic: set
-    _atom_end_basic_or_escape_regexp: str
+    closing_brackets: frozenset
+    token_re: re.Pattern
 
+    # A backslash and the letter it escapes, in strings and atoms.
+    _escape_re = re.compile(r'\\[\s\S]')
 
     def __init__(self, string, string_to=None, nil='nil', true='t', false=None,
                  line_comment=';'):
@@ -653,71 +698,86 @@ class Parser(object):
         self.false = false
         self.string_to = (lambda x: x) if string_to is None else string_to
         self.line_comment = line_comment
+        self._symbols = {}
 
         # Compute brackets from delimiter
         self.brackets = Delimiters.get_brackets()
-        self.closing_brackets = set(self.brackets.values())
-        self._atom_end_basic = \
-            set(self.brackets) | set(self.closing_brackets) | \
-            set('"') | set(whitespace)
-        self._atom_end_basic_or_escape_regexp = "|".join(map(re.escape,
-                                                         self._atom_end_basic | set('\\')))
-        self.quote_or_escape_re = re.compile(r'"|\\')
-        self.atom_end = set([line_comment]) | self._atom_end_basic
-        self.atom_end_or_escape_re = \
-            re.compile("{0}|{1}".format(self._atom_end_basic_or_escape_regexp,
-                                        re.escape(line_comment)))
-
-
-    def parse_str(self, i):
-        string = self.string
-        chars = []
-        append = chars.append
-        search = self.quote_or_escape_re.search
-
-        assert string[i] == '"'  # never fail
-        while True:
-            i += 1
-            match = search(string, i)
-            end = match.start()
-            append(string[i:end])
-            c = match.group()
-            if c == '"':
-                i = end + 1
-                break
-            elif c == '\\':
-                i = end + 1
-                append(String.unquote(c + string[i]))
-        else:
-            raise ExpectClosingBracket('"', None)
-        return (i, ''.join(chars))
+        (self.closing_brackets,
+         self.token_re, _) = self._syntax_tables(self.brackets, line_comment)
 
-    def parse_atom(self, i):
-        string = self.string
-        chars = []
-        append = chars.append
-        search = self.atom_end_or_escape_re.search
-        atom_end = self.atom_end
-
-        while True:
-            match = search(string, i)
-            if not match:
-                append(string[i:])
-                i = len(string)
-                break
-            end = match.start()
-            append(string[i:end])
-            c = match.group()
-            if c in atom_end:
-                i = end  # this is different from str
-                break
-            elif c == '\\':
-                i = end + 1
-                append(Symbol.unquote(c + string[i]))
-            i += 1
+    @staticmethod
+    def _syntax_tables(brackets, line_comment):
+        return Parser._build_syntax_tables(
+            frozenset(brackets.items()), line_comment)
+
+    # Syntax tables only depend on the delimiters and the comment
+    # character, so they are built once per combination and shared.
+    # The cache is bounded, like re's own, so that callers cycling
+    # through comment strings or short-lived Delimiters subclasses
+    # don't keep compiled patterns alive forever.
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _build_syntax_tables(bracket_items, line_comment):
+        brackets = dict(bracket_items)
+        closing_brackets = frozenset(brackets.values())
+        atom_end = \
+            frozenset(brackets) | closing_brackets | \
+            frozenset('"\\') | frozenset(whitespace)
+        atom_char = '[^{0}]'
+        if len(line_comment) == 1:
+            atom_end |= frozenset(line_comment)
         else:
-            raise ExpectClosingBracket('"', None)
-        return (i, self.atom(''.join(chars)))
+            atom_char = '(?:(?!{1}){0})'.format(atom_char, '{1}')
+
+        def char_class(chars):
+            return ''.join(map(re.escape, sorted(chars)))
+
+        # The tokenizer: every match is optional blank space and line
+        # comments followed by exactly one token.  parse_sexp dispatches
+        # on the number of the group that matched (`Match.lastindex`).
+        # Every character can start some token, so consecutive matches
+        # always cover the input without gaps.
+        atom = r'(?:{atom_char}+|\\[\s\S]?)+'.format(
+            atom_char=atom_char.format(char_class(atom_end),
+                                       re.escape(line_comment)))
+        token_re = re.compile(
+            r'(?:[{space}]+|{comment}[^\n]*)*'
+            r'(?:([{opening}])'                      # 1: opening bracket
+            r'|([{closing}])'                        # 2: closing bracket
+            r"|(')"                                  # 3: quote
+            r'|"([^"\\]*(?:\\[\s\S][^"\\]*)*)"'      # 4: string body
+            r'|({atom})'                             # 5: atom
+            r'|(")'                                  # 6: unterminated string
+            r'|(\Z))'.format(                        # 7: end of input
+                space=char_class(whitespace),
+                comment=re.escape(line_comment),
+                opening=char_class(brackets),
+                closing=char_class(closing_brackets),
+                atom=atom))
+        # The rest of an atom, for IncrementalParser.  A quote inside an
+        # atom is part of it, while token_re would start a new token.
+        atom_re = re.compile(atom)
+
+        return (closing_brackets, token_re, atom_re)
+
+    # ASCII letters that int() or float() can accept first: digits,
+    # signs, the dot and (escaped) whitespace.
+    _number_start = frozenset(
+        c for c in map(chr, range(128))
+        if c.isspace() or c in '0123456789+-.')
+
+    # Plain unsigned integers are converted without any further checks.
+    _digits = frozenset('0123456789')
+
+    # After a sign, only a digit, the dot or a float word may follow.
+    _signs = frozenset('+-')
+    _unsigned_start = frozenset('0123456789.')
+
+    # Unsigned words float() accepts, in lower case.  Other symbols
+    # starting with "i" or "n" (if, nth, insert, ...) are not numbers.
+    _float_words = frozenset(['inf', 'infinity', 'nan'])
+    _float_word_start = frozenset('iInN')
+    _float_only = frozenset('.eEiInN')
 
     def atom(self, token):
         if token == self.nil:
@@ -726,55 +786,105 @@ class Parser(object):
             return True
         if token == self.false:
             return False
-        try:
+        # Most atoms are plain symbols; don't pay for two failed
+        # conversions (and their exceptions) to find that out.
+        first = token[:1]
+        if first in self._digits and token.isdecimal():
             return int(token)
-        except ValueError:
+        if first in self._signs:
+            unsigned = token[1:]
+            first = unsigned[:1]
+            number_start = self._unsigned_start
+        else:
+            unsigned = token
+            number_start = self._number_start
+        if first >= '\x80' or first in number_start or (
+                first in self._float_word_start and
+                unsigned.rstrip().lower() in self._float_words):
+            # int() rejects any dot, exponent or inf/nan letter; leave
+            # such atoms to float() without the failed int() first.
+            if self._float_only.isdisjoint(token):
+                try:
+                    return int(token)
+                except ValueError:
+                    pass
             try:
                 return float(token)
             except ValueError:
-                return Symbol(token)
+                pass
+        # The same names come up over and over in a document; build one
+        # Symbol per distinct name and share it.
+        symbol = self._symbols.get(token)
+        if symbol is None:
+            symbol = self._symbols[token] = Symbol(token)
+        return symbol
 
     def parse_sexp(self, i):
         string = self.string
-        len_string = len(self.string)
         sexp = []
         append = sexp.append
-        while i < len_string:
-            c = string[i]
-            if c == '"':
-                (i, subsexp) = self.parse_str(i)
-                append(self.string_to(subsexp))
-            elif c in whitespace:
-                i += 1
+        # Nesting is tracked with an explicit stack instead of recursion,
+        # so deeply nested input does not hit the recursion limit.  Each
+        # frame is (enclosing list, opening bracket, enclosing quotes).
+        stack = []
+        # Positions of apostrophes still waiting for their s-exp.
+        quotes = []
+        # Bind everything used per token to locals.
+        brackets = self.brackets
+        atom = self.atom
+        string_to = self.string_to
+        unescape = self._escape_re.sub
+        for match in self.token_re.finditer(string, i):
+            kind = match.lastindex
+            if kind == 5:  # atom
+                token = match.group(5)
+                if '\\' in token:
+                    token = unescape(
+                        lambda m: Symbol.unquote(m.group()), token)
+                subsexp = atom(token)
+            elif kind == 1:  # opening bracket
+                stack.append((sexp, match.group(1), quotes))
+                sexp = []
+                append = sexp.append
+                quotes = []
                 continue
-            elif c in self.brackets:
-                close = self.brackets[c]
-                (i, subsexp) = self.parse_sexp(i + 1)
-                append(bracket(subsexp, c))
-                try:
-                    nc = string[i]
-                except IndexError:
-                    nc = None
-                if nc != close:
-                    raise ExpectClosingBracket(nc, close)
-                i += 1
-            elif c in self.closing_brackets:
-                break
-            elif c == "'":
-                next_parse_start = i + 1
-                (i, subsexp) = self.parse_sexp(next_parse_start)
-                if not subsexp:
-                    raise ExpectSExp(next_parse_start - 1)
-                append(Quoted(subsexp[0]))
-                sexp.extend(subsexp[1:])
-            elif c == self.line_comment:
-                i = string.find('\n', i) + 1
-                if i <= 0:
-                    i = len_string
+            elif kind == 2:  # closing bracket
+                if quotes:
+                    raise ExpectSExp(quotes[-1])
+                if not stack:
+                    i = match.start(2)
                     break
-            else:
-                (i, subsexp) = self.parse_atom(i)
-                append(subsexp)
+                (parent, opener, quotes) = stack.pop()
+                close = brackets[opener]
+                c = match.group(2)
+                if c != close:
+                    raise ExpectClosingBracket(c, close)
+                subsexp = bracket(sexp, opener)
+                sexp = parent
+                append = sexp.append
+            elif kind == 4:  # string
+                token = match.group(4)
+                if '\\' in token:
+                    token = unescape(
+                        lambda m: String.unquote(m.group()), token)
+                subsexp = string_to(token)
+            elif kind == 3:  # quote
+                quotes.append(match.start(3))
+                continue
+            elif kind == 6:  # unterminated string
+                raise ExpectClosingBracket(None, '"')
+            else:  # end of input
+                i = len(string)
+                break
+            if quotes:
+                for _ in quotes:
+                    subsexp = Quoted(subsexp)
+                del quotes[:]
+            append(subsexp)
+        if quotes:
+            raise ExpectSExp(quotes[-1])
+        if stack:
+            raise ExpectClosingBracket(None, brackets[stack[-1][1]])
         return (i, sexp)
 
     def parse(self):
@@ -797,6 +907,178 @@ def parse(string, **kwds):
     >>> parse("(a '(b))")
     [[Symbol('a'), Quoted([Symbol('b')])]]
 
+    An iterable of strings, such as the lines of a text file, is joined
+    once and parsed as a whole:
+
+    >>> parse(['(a', ' b)'])
+    [[Symbol('a'), Symbol('b')]]
+
     """
-    assert type(string)==str
+    if not isinstance(string, str):
+        assert not isinstance(string, (bytes, bytearray, memoryview))
+        string = ''.join(string)
     return Parser(string, **kwds).parse()
+
+
+class IncrementalParser:
+
+    """
+    Parse s-expressions from text that arrives in pieces.
+
+    `feed` returns the top-level s-expressions completed by a chunk.
+    Once an s-expression has been returned, later input never changes
+    it.  `finish` parses whatever text is left.  Keyword arguments are
+    the same as for `parse`.
+
+    >>> p = IncrementalParser()
+    >>> p.feed('(a b) (c')
+    [[Symbol('a'), Symbol('b')]]
+    >>> p.feed(' d) e')
+    [[Symbol('c'), Symbol('d')]]
+    >>> p.feed('f ')
+    [Symbol('ef')]
+    >>> p.finish()
+    []
+
+    """
+
+    def __init__(self, **kwds):
+        self._kwds = kwds
+        self._reset()
+
+    def _reset(self):
+        # Scanned text of the unfinished top-level s-exp, as pieces that
+        # are joined only once it is complete.  Blank space and comments
+        # in it are collapsed to one space, and dropped between top-level
+        # s-exps, so nothing is held on to for idle input.
+        self._scanned = []
+        self._depth = 0
+        # Whether the scanned text ends in a top-level atom that the next
+        # chunk may continue.
+        self._atom_open = False
+        # The last few letters of a trailing atom that the next chunk may
+        # still change: an unpaired backslash, or the start of a
+        # multi-letter line comment.
+        self._tail = ''
+        # Whether the input ends inside a line comment.
+        self._comment = False
+        # Pieces of an unterminated string at the end of the input, and
+        # whether its last piece ends in an unpaired backslash.
+        self._string = None
+        self._escaped = False
+
+    # The body of a string up to the closing quote (or the end of text).
+    _string_body_re = re.compile(r'[^"\\]*(?:\\[\s\S][^"\\]*)*')
+
+    def feed(self, chunk):
+        # Every branch below looks at the new chunk (plus a tail of at
+        # most a few letters) only, so feeding is linear in the input.
+        if self._string is not None:
+            # Only look for the closing quote in the new text; the rest
+            # of the string has been checked already.
+            start = 1 if self._escaped and chunk else 0
+            end = self._string_body_re.match(chunk, start).end()
+            if chunk[end:] in ('', '\\'):
+                # Still no closing quote.  A lone backslash at the end
+                # escapes the first letter of the next chunk.
+                self._string.append(chunk)
+                if chunk:
+                    self._escaped = end < len(chunk)
+                return []
+            text = ''.join(self._string) + chunk
+            self._string = None
+        elif self._comment:
+            newline = chunk.find('\n')
+            if newline < 0:
+                return []
+            self._comment = False
+            text = chunk[newline:]
+        else:
+            text = self._tail + chunk
+        # Look the syntax up on every feed, as `parse` does, so that
+        # Delimiters subclasses defined meanwhile are taken into account.
+        line_comment = self._kwds.get('line_comment', ';')
+        (_, token_re, atom_re) = Parser._syntax_tables(
+            Delimiters.get_brackets(), line_comment)
+        scanned = self._scanned
+        depth = self._depth
+        end = 0
+        complete = False
+        if self._atom_open:
+            # The text starts with more of a top-level atom, up to the
+            # first letter that cannot be part of it.
+            match = atom_re.match(text)
+            end = match.end() if match else 0
+            complete = end < len(text)
+        continues = self._atom_open and not complete
+        if continues:
+            (kind, start, kind_start, end) = (5, 0, 0, 0)
+        else:
+            # Track bracket depth only; text is handed to `parse` once a
+            # top-level s-exp is complete.
+            for match in token_re.finditer(text, end):
+                kind = match.lastindex
+                if kind > 5 or kind == 5 and match.end() == len(text):
+                    # An atom, string or comment that may continue in the
+                    # next chunk, or the end of the text.
+                    break
+                if kind == 1:
+                    depth += 1
+                    continue
+                if kind == 2:
+                    depth -= 1
+                if kind == 3 or depth > 0:
+                    continue
+                end = match.end()
+                complete = True
+                if depth < 0:
+                    # Stray closing bracket; let `parse` report it.
+                    depth = 0
+                    break
+            (start, kind_start) = (match.start(), match.start(kind))
+        self._depth = depth
+        self._atom_open = False
+        self._tail = ''
+        if complete:
+            done = ''.join(scanned) + text[:end]
+            scanned = self._scanned = []
+        else:
+            done = ''
+        if end > start:
+            # After a stray closing bracket; `parse` raises below.
+            self._tail = text[end:]
+            return parse(done, **self._kwds)
+        if end < start:
+            scanned.append(text[end:start])
+        if kind_start > start and scanned and scanned[-1] != ' ':
+            # Blank space or comments before the last token.
+            scanned.append(' ')
+        if kind == 5:
+            # Keep back only what the next chunk could still change.
+            atom = kind_start
+            stop = max(atom, len(text) - (len(line_comment) - 1))
+            i = stop
+            while i > atom and text[i - 1] == '\\':
+                i -= 1
+            stop -= (stop - i) % 2
+            if stop > atom:
+                scanned.append(text[atom:stop])
+            self._tail = text[stop:]
+            self._atom_open = depth == 0 and (stop > atom or continues)
+        elif kind == 6:
+            string = text[kind_start:]
+            self._string = [string]
+            self._escaped = \
+                self._string_body_re.match(string, 1).end() < len(string)
+        else:
+            blank = text[start:]
+            last_line = blank[blank.rfind('\n') + 1:]
+            self._comment = last_line.strip(whitespace) != ''
+        return parse(done, **self._kwds)
+
+    def finish(self):
+        text = ''.join(self._scanned) + self._tail
+        if self._string is not None:
+            text += ''.join(self._string)
+        self._reset()
+        return parse(text, **self._kwds)
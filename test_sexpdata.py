@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
-from __future__ import unicode_literals
-
 from sexpdata import (
-    PY3,
     ExpectClosingBracket, ExpectNothing, ExpectSExp,
     parse, tosexp, Symbol, String, Quoted, bracket, Parens,
-    Brackets, Delimiters,
+    Brackets, Delimiters, IncrementalParser,
 )
+import pickle
+import sys
 import unittest
 
 import pytest
@@ -46,18 +45,56 @@ data_identity = [
     "日本語能力!!ソﾊﾝｶｸ",
 ]
 
-data_identity += map(lambda x: x[0], String._lisp_quoted_specials)
-data_identity += map(lambda x: x[1], String._lisp_quoted_specials)
+(raw_specials, quoted_specials) = zip(*String._lisp_quoted_specials)
+data_identity += raw_specials
+data_identity += quoted_specials
+data_identity = tuple(data_identity)
+
+
+@pytest.mark.parametrize('data', data_identity)
+def test_identity(data):
+    parsed = parse(tosexp(data))[0]
+    if type(data) is Symbol:
+        # Symbols are interned, so this is the very same object.
+        assert parsed is data
+    else:
+        assert parsed == data
+
+
+@pytest.mark.parametrize('data', data_identity)
+def test_identity_pretty_print(data):
+    assert parse(tosexp(data, pretty_print=True))[0] == data
+
+
+def test_identity_batch():
+    assert parse(tosexp(data_identity))[0] == list(data_identity)
+    assert parse(' '.join(map(tosexp, data_identity))) == list(data_identity)
 
 
-def test_identity():
-    for data in data_identity:
-        assert parse(tosexp(data))[0] == data
+@pytest.mark.parametrize('data', data_identity)
+def test_pickle(data):
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(data, protocol)) == data
 
 
-def test_identity_pretty_print():
-    for data in data_identity:
-        assert parse(tosexp(data, pretty_print=True))[0] == data
+def test_symbols_are_interned():
+    a = Symbol('a')
+    assert Symbol('a') is a
+    assert parse('(a a)')[0][0] is a
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(a, protocol)) is a
+    assert Symbol('b') is not a
+
+
+def test_symbol_interning_uses_the_string_value():
+    assert Symbol(Symbol('a')) is Symbol('a')
+    one = Symbol(1)
+    assert type(one) is Symbol and one == Symbol('1')
+    assert Symbol(1.0) == Symbol('1.0')
+    assert Symbol(True) == Symbol('True')
+    assert Symbol(b'a', 'ascii') is Symbol('a')
+    assert Symbol(object='a') is Symbol('a')
+    assert Symbol() is Symbol('')
 
 
 class BaseTestCase(unittest.TestCase):
@@ -155,10 +192,6 @@ class TestUnicode(BaseTestCase):
 
     ustr = "日本語能力!!ソﾊﾝｶｸ"
 
-#    if not PY3:
-        # Let's not support dumping/parsing bytes.
-        # (In Python 3, ``string.encode()`` returns bytes.)
-
     def test_dump_raw_utf8(self):
         """
         Test that sexpdata supports dumping encoded (raw) string.
@@ -176,26 +209,40 @@ class TestUnicode(BaseTestCase):
         self.assert_parse(sexp, ustr)
 
 
-def test_tosexp_str_as():
-    assert tosexp('a', str_as='symbol') == 'a'
-    assert tosexp(['a'], str_as='symbol') == '(a)'
-    assert tosexp('a') == '"a"'
-    assert tosexp(['a']) == '("a")'
-    assert tosexp(Quoted('a')) == '\'"a"'
-    assert tosexp(Quoted(['a']), str_as='symbol') == '\'(a)'
-    assert tosexp([Quoted('a')], str_as='symbol') == '(\'a)'
-    assert tosexp(Quoted('a'), str_as='symbol') == '\'a'
-    assert tosexp(Quoted(['a'])) == '\'("a")'
-    assert tosexp([Quoted('a')]) == '(\'"a")'
-
-
-def test_tosexp_tuple_as():
-    assert tosexp(('a', 'b')) == '("a" "b")'
-    assert tosexp(('a', 'b'), tuple_as='array') == '["a" "b"]'
-    assert tosexp([('a', 'b')]) == '(("a" "b"))'
-    assert tosexp([('a', 'b')], tuple_as='array') == '(["a" "b"])'
-    assert tosexp(Quoted(('a',))) == '\'("a")'
-    assert tosexp(Quoted(('a',)), tuple_as='array') == '\'["a"]'
+@pytest.mark.parametrize(('obj', 'kwds', 'sexp'), [
+    # str_as
+    ('a', dict(str_as='symbol'), 'a'),
+    (['a'], dict(str_as='symbol'), '(a)'),
+    ('a', dict(), '"a"'),
+    (['a'], dict(), '("a")'),
+    (Quoted('a'), dict(), '\'"a"'),
+    (Quoted(['a']), dict(str_as='symbol'), '\'(a)'),
+    ([Quoted('a')], dict(str_as='symbol'), '(\'a)'),
+    (Quoted('a'), dict(str_as='symbol'), '\'a'),
+    (Quoted(['a']), dict(), '\'("a")'),
+    ([Quoted('a')], dict(), '(\'"a")'),
+    # tuple_as
+    (('a', 'b'), dict(), '("a" "b")'),
+    (('a', 'b'), dict(tuple_as='array'), '["a" "b"]'),
+    ([('a', 'b')], dict(), '(("a" "b"))'),
+    ([('a', 'b')], dict(tuple_as='array'), '(["a" "b"])'),
+    (Quoted(('a',)), dict(), '\'("a")'),
+    (Quoted(('a',)), dict(tuple_as='array'), '\'["a"]'),
+])
+def test_tosexp(obj, kwds, sexp):
+    assert tosexp(obj, **kwds) == sexp
+
+
+@pytest.mark.parametrize(('obj', 'sexp'), [
+    (Symbol('a'), 'a'),
+    (Symbol('a' * 16), 'a' * 16),
+    (Symbol('a b'), 'a\\ b'),
+    (String('a'), '"a"'),
+    (String('a\n'), '"a\\n"'),
+])
+def test_tosexp_returns_plain_str(obj, sexp):
+    assert type(tosexp(obj)) is str
+    assert tosexp(obj) == sexp
 
 
 def test_tosexp_value_errors():
@@ -217,15 +264,142 @@ def test_not_enough_brackets():
         parse("(a (b)")
 
 
+def test_not_enough_double_quotes():
+    with pytest.raises(ExpectClosingBracket):
+        parse('("a)')
+    with pytest.raises(ExpectClosingBracket):
+        parse('"a\\')
+
+
+def test_mismatched_brackets():
+    with pytest.raises(ExpectClosingBracket):
+        parse("(a b]")
+    with pytest.raises(ExpectClosingBracket):
+        parse("[a (b])")
+
+
+def test_deeply_nested_sexp():
+    depth = sys.getrecursionlimit() * 2
+    sexp = parse('(' * depth + 'a' + ')' * depth)[0]
+    for _ in range(depth - 1):
+        (sexp,) = sexp
+    assert sexp == [Symbol('a')]
+
+
 def test_no_eol_after_comment():
     assert parse('a ; comment') == [Symbol('a')]
 
 
+def test_multi_letter_line_comment():
+    assert parse('(a b//c // d\ne)', line_comment='//') == \
+        [[Symbol('a'), Symbol('b'), Symbol('e')]]
+
+
 def test_issue_4():
     assert parse("(0 ;; (\n)") == [[0]]
     assert parse("(0;; (\n)") == [[0]]
 
 
+def test_quote_takes_one_sexp():
+    assert parse("'a b") == [Quoted(Symbol('a')), Symbol('b')]
+    assert parse("('(a) b)") == [[Quoted([Symbol('a')]), Symbol('b')]]
+    assert parse("(''a b)") == [[Quoted(Quoted(Symbol('a'))), Symbol('b')]]
+    assert parse("(' ; comment\n a b)") == [[Quoted(Symbol('a')), Symbol('b')]]
+
+
+def assert_atoms(sexp, expected):
+    parsed = parse(sexp)[0]
+    assert len(parsed) == len(expected)
+    for (got, want) in zip(parsed, expected):
+        assert type(got) is type(want)
+        assert repr(got) == repr(want)  # also matches nan to nan
+
+
+def test_parse_inf_nan_words():
+    nan = float('nan')
+    inf = float('inf')
+    assert_atoms(
+        '(inf -Inf nan Infinity +nan infinit nth if null insert'
+        ' \u0661 \u0661.\u0665)',  # Arabic-Indic 1 and 1.5
+        [inf, -inf, nan, inf, nan,
+         Symbol('infinit'), Symbol('nth'), Symbol('if'), Symbol('null'),
+         Symbol('insert'), 1, 1.5])
+
+
+def test_parse_number_starts():
+    assert_atoms(
+        r'(1e3 5E8 .5 -.5 +1 -1 1_000 1. \ 1 1\  \ 1.5'
+        r' - + -x1 +. . .e1 x1 1+ 1-)',
+        [1000.0, 500000000.0, 0.5, -0.5, 1, -1, 1000, 1.0, 1, 1, 1.5,
+         Symbol('-'), Symbol('+'), Symbol('-x1'), Symbol('+.'), Symbol('.'),
+         Symbol('.e1'), Symbol('x1'), Symbol('1+'), Symbol('1-')])
+
+
+def test_nil_is_a_new_list_each_time():
+    (a, b) = parse('(nil nil)')[0]
+    assert a == b == []
+    assert a is not b
+
+
+def test_parse_iterable_of_strings():
+    import io
+    assert parse(io.StringIO('(a\n b)\n"c"\n')) == \
+        [[Symbol('a'), Symbol('b')], 'c']
+    assert parse(iter(['(a "b', ' c")'])) == [[Symbol('a'), 'b c']]
+
+
+def test_incremental_parser_one_char_at_a_time():
+    text = '(a [b "c \\" d"]) \'e ; f\n12.5 (g)'
+    parser = IncrementalParser()
+    seen = []
+    for (i, c) in enumerate(text):
+        for sexp in parser.feed(c):
+            seen.append((i, sexp))
+    seen += [(None, sexp) for sexp in parser.finish()]
+    assert [sexp for (_, sexp) in seen] == parse(text)
+    # Each s-exp comes out as soon as the text shows it is complete.
+    assert [i for (i, _) in seen] == [15, 19, 28, 31]
+
+
+def test_incremental_parser_sees_new_delimiters():
+    parser = IncrementalParser()
+    assert parser.feed('(a') == []
+
+    class Braces(Delimiters):
+        opener, closer = '{', '}'
+
+    assert parser.feed(' {b}') == []
+    assert parser.feed(')') == [[Symbol('a'), Braces([Symbol('b')])]]
+
+
+def test_incremental_parser_long_string_in_pieces():
+    parser = IncrementalParser()
+    for chunk in ['"a', 'b\\', '"c', '\\', '\\']:
+        assert parser.feed(chunk) == []
+    assert parser.feed('" d') == ['ab"c\\']
+    assert parser.finish() == [Symbol('d')]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 16])
+def test_incremental_parser_long_symbol_in_pieces(size):
+    text = "a'b\\ c" * 100 + ' d'
+    parser = IncrementalParser()
+    seen = []
+    for i in range(0, len(text), size):
+        seen += parser.feed(text[i:i + size])
+    assert seen + parser.finish() == parse(text)
+    assert seen == parse(text)[:1]
+
+
+def test_incremental_parser_errors():
+    with pytest.raises(ExpectNothing):
+        IncrementalParser().feed('(a))')
+    parser = IncrementalParser()
+    assert parser.feed('(a') == []
+    with pytest.raises(ExpectClosingBracket):
+        parser.finish()
+
+
 def test_issue_18():
     import sexpdata
     sexp = "(foo)'   "